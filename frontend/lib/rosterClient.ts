@@ -6,9 +6,12 @@ import type { EngineCriteria, EngineMessage, RosterResult } from '@/types/roster
 const WS_ENDPOINT = process.env.NEXT_PUBLIC_ROSTER_WS ?? 'ws://localhost:8000/ws/roster';
 const REST_ENDPOINT = process.env.NEXT_PUBLIC_ROSTER_REST ?? 'http://localhost:8000/api/solve';
 
+const textDecoder = new TextDecoder();
+
 function parseMessage(data: MessageEvent['data']): EngineMessage | null {
   try {
-    const parsed = JSON.parse(typeof data === 'string' ? data : data.toString());
+    const raw = data instanceof ArrayBuffer ? textDecoder.decode(data) : String(data);
+    const parsed = JSON.parse(raw);
     if (parsed && typeof parsed.type === 'string' && 'payload' in parsed) {
       return parsed as EngineMessage;
     }
@@ -83,6 +86,7 @@ export function useRosteringEngine(initialResult?: RosterResult) {
 
   useEffect(() => {
     const socket = new WebSocket(WS_ENDPOINT);
+    socket.binaryType = 'arraybuffer';
     wsRef.current = socket;
 
     socket.onopen = () => {
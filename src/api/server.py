@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from functools import cache
+from typing import AsyncIterator, Callable, Dict, List, Optional, Protocol, Tuple, Union
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import msgspec
+import numpy as np
+import orjson
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.api import _numeric
 from src.rostering.engine import (
     DemandSlot,
     GuardProfile,
@@ -17,63 +29,126 @@ from src.rostering.engine import (
     RosterConstraintConfig,
     RosterEngine,
     SoftConstraintWeights,
+    warm_up as warm_up_engine,
 )
 
 
+@cache
 def to_camel(string: str) -> str:
     parts = string.split("_")
     return parts[0] + "".join(word.capitalize() for word in parts[1:])
 
 
-class CamelModel(BaseModel):
+class CamelRequestModel(BaseModel):
+    """Request-side base; accepts both camelCase and snake_case input."""
+
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
 
-class EngineCriteriaModel(CamelModel):
+class EngineCriteriaModel(CamelRequestModel):
     sliders: Dict[str, float]
     toggles: Dict[str, bool]
     scenario_name: str = Field(alias="scenarioName")
 
 
-class AssignmentModel(CamelModel):
-    slot_id: str
-    guard_id: str
+class EngineCriteriaDecode(msgspec.Struct):
+    """Websocket-side criteria, decoded by msgspec with the REST model's lax coercion.
+
+    msgspec has no field aliases, so the ``scenarioName`` and ``scenario_name``
+    spellings the REST model accepts are decoded into separate fields.
+    """
+
+    sliders: Dict[str, float]
+    toggles: Dict[str, bool]
+    camel_name: Union[str, msgspec.UnsetType] = msgspec.field(default=msgspec.UNSET, name="scenarioName")
+    snake_name: Union[str, msgspec.UnsetType] = msgspec.field(default=msgspec.UNSET, name="scenario_name")
+
+    def __post_init__(self) -> None:
+        if self.camel_name is msgspec.UNSET and self.snake_name is msgspec.UNSET:
+            raise ValueError("scenarioName is required")
+
+    @property
+    def scenario_name(self) -> str:
+        name = self.camel_name if self.camel_name is not msgspec.UNSET else self.snake_name
+        assert isinstance(name, str)
+        return name
+
+
+class CriteriaMessage(msgspec.Struct, tag_field="type", tag="criteria"):
+    payload: EngineCriteriaDecode
+
+
+class EngineCriteria(Protocol):
+    """Criteria fields read by the service, satisfied by both request types."""
+
+    sliders: Dict[str, float]
+    toggles: Dict[str, bool]
+
+    @property
+    def scenario_name(self) -> str: ...
+
+
+class CamelResponseModel(msgspec.Struct):
+    """Response-side base; camelCase wire names are declared per field to match the frontend types."""
+
+
+class AssignmentModel(CamelResponseModel):
+    slot_id: str = msgspec.field(name="slotId")
+    guard_id: str = msgspec.field(name="guardId")
     start: datetime
     end: datetime
 
 
-class KPIModel(CamelModel):
+class KPIModel(CamelResponseModel):
     label: str
     value: str
     delta: Optional[str] = None
     status: Optional[str] = None
 
 
-class ScenarioComparisonModel(CamelModel):
+class ScenarioComparisonModel(CamelResponseModel, kw_only=True):
     name: str
-    objective_value: Optional[float] = None
-    coverage_score: float
-    fairness_score: float
+    objective_value: Optional[float] = msgspec.field(default=None, name="objectiveValue")
+    coverage_score: float = msgspec.field(name="coverageScore")
+    fairness_score: float = msgspec.field(name="fairnessScore")
     feasibility: bool
 
 
-class RosterResponseModel(CamelModel):
+class RosterResponseModel(CamelResponseModel):
     feasible: bool
-    objective_value: Optional[float]
+    objective_value: Optional[float] = msgspec.field(name="objectiveValue")
     assignments: List[AssignmentModel]
     kpis: List[KPIModel]
     comparisons: List[ScenarioComparisonModel]
 
 
+_json_encoder = msgspec.json.Encoder()
+_msgpack_encoder = msgspec.msgpack.Encoder()
+# Lax decoding coerces numeric strings and 0/1 like the Pydantic REST model does.
+_criteria_message_decoder = msgspec.json.Decoder(CriteriaMessage, strict=False)
+_criteria_message_msgpack_decoder = msgspec.msgpack.Decoder(CriteriaMessage, strict=False)
+
+# Websocket subprotocols; JSON remains the default for clients that offer neither.
+MSGPACK_SUBPROTOCOL = "application/msgpack"
+JSON_SUBPROTOCOL = "application/json"
+
+# Schedules depend only on the criteria, so encoded responses are reused.
+_SCHEDULE_CACHE_SIZE = 128
+_SCHEDULE_CACHE_TTL_SECONDS = 60.0
+
+
 class RosteringService:
     """Coordinates calls into the rostering engine and crafts dashboard payloads."""
 
     def __init__(self) -> None:
-        self._engine: Optional[RosterEngine]
+        # Engines are reused across requests; each worker thread borrows one at a time.
+        self._engine_pool: "queue.SimpleQueue[RosterEngine]" = queue.SimpleQueue()
         try:
-            self._engine = RosterEngine()
+            self._engine_pool.put(RosterEngine())
         except ImportError:
-            self._engine = None
+            self._engine_available = False
+        else:
+            self._engine_available = True
 
         base = datetime.utcnow().replace(hour=6, minute=0, second=0, microsecond=0)
         self._guards = [
@@ -88,9 +163,18 @@ class RosteringService:
             DemandSlot(slot_id="C3", start=base + timedelta(hours=8), end=base + timedelta(hours=12), required_guards=1),
             DemandSlot(slot_id="D4", start=base + timedelta(hours=12), end=base + timedelta(hours=18), required_guards=1),
         ]
+        # Per-slot lookups for _build_response; the slots are fixed for the service's lifetime.
+        self._slot_lookup: Dict[str, Tuple[int, DemandSlot]] = {
+            slot.slot_id: (position, slot) for position, slot in enumerate(self._slots)
+        }
+        self._slot_required = np.fromiter(
+            (slot.required_guards for slot in self._slots), dtype=np.int64, count=len(self._slots)
+        )
+        self._cache: "OrderedDict[bytes, Tuple[float, RosterResponseModel, bytes]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
-    def generate_schedule(self, criteria: EngineCriteriaModel) -> RosterResponseModel:
-        if self._engine:
+    def generate_schedule(self, criteria: EngineCriteria) -> RosterResponseModel:
+        if self._engine_available:
             schedule = self._solve_with_engine(criteria)
         else:
             schedule = None
@@ -99,7 +183,50 @@ class RosteringService:
             schedule = self._mock_schedule(criteria)
         return schedule
 
-    def _solve_with_engine(self, criteria: EngineCriteriaModel) -> Optional[RosterResponseModel]:
+    def cached_schedule_bytes(self, criteria: EngineCriteria, wire_format: str = "json") -> Optional[bytes]:
+        """Return the cached encoding for ``criteria`` if a fresh one exists.
+
+        ``wire_format`` is ``"json"`` (stored pre-encoded) or ``"msgpack"``
+        (encoded from the cached schedule on demand).
+        """
+
+        key = self._schedule_cache_key(criteria)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._cache.move_to_end(key)
+        _, schedule, body = entry
+        return body if wire_format == "json" else _msgpack_encoder.encode(schedule)
+
+    def generate_schedule_bytes(self, criteria: EngineCriteria, wire_format: str = "json") -> bytes:
+        """Return the encoded schedule, reusing a cached schedule when fresh."""
+
+        cached = self.cached_schedule_bytes(criteria, wire_format)
+        if cached is not None:
+            return cached
+
+        schedule = self.generate_schedule(criteria)
+        body = _json_encoder.encode(schedule)
+        key = self._schedule_cache_key(criteria)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + _SCHEDULE_CACHE_TTL_SECONDS, schedule, body)
+            self._cache.move_to_end(key)
+            while len(self._cache) > _SCHEDULE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return body if wire_format == "json" else _msgpack_encoder.encode(schedule)
+
+    @staticmethod
+    def _schedule_cache_key(criteria: EngineCriteria) -> bytes:
+        return hashlib.blake2b(
+            orjson.dumps(
+                [criteria.sliders, criteria.toggles, criteria.scenario_name],
+                option=orjson.OPT_SORT_KEYS,
+            ),
+            digest_size=16,
+        ).digest()
+
+    def _solve_with_engine(self, criteria: EngineCriteria) -> Optional[RosterResponseModel]:
         sliders = criteria.sliders
         toggles = criteria.toggles
 
@@ -116,13 +243,26 @@ class RosteringService:
         )
         config = RosterConstraintConfig(hard=hard, soft=soft)
         try:
-            engine = RosterEngine(config)
+            engine = self._engine_pool.get_nowait()
+        except queue.Empty:
+            engine = RosterEngine()
+        try:
+            engine.update_config(config)
             result = engine.solve(self._guards, self._slots)
         except Exception:
             return None
-        return self._build_response(criteria, result.assignments, result.objective_value, result.feasible)
+        finally:
+            self._engine_pool.put(engine)
+        return self._build_response(
+            criteria,
+            result.assignments,
+            result.objective_value,
+            result.feasible,
+            result.coverage_required,
+            result.coverage_assigned,
+        )
 
-    def _mock_schedule(self, criteria: EngineCriteriaModel) -> RosterResponseModel:
+    def _mock_schedule(self, criteria: EngineCriteria) -> RosterResponseModel:
         coverage = criteria.sliders.get("coverage", 80)
         fairness = criteria.sliders.get("fairness", 50)
         assignments_map: Dict[str, List[str]] = {
@@ -136,18 +276,23 @@ class RosteringService:
 
     def _build_response(
         self,
-        criteria: EngineCriteriaModel,
+        criteria: EngineCriteria,
         assignments_map: Dict[str, List[str]],
         objective_value: Optional[float],
         feasible: bool,
+        coverage_required: Optional[np.ndarray] = None,
+        coverage_assigned: Optional[np.ndarray] = None,
     ) -> RosterResponseModel:
-        slot_lookup = {slot.slot_id: slot for slot in self._slots}
+        slot_lookup = self._slot_lookup
         assignments: List[AssignmentModel] = []
+        slot_positions: List[int] = []
         for guard_id, slot_ids in assignments_map.items():
             for slot_id in slot_ids:
-                slot = slot_lookup.get(slot_id)
-                if not slot:
+                entry = slot_lookup.get(slot_id)
+                if not entry:
                     continue
+                position, slot = entry
+                slot_positions.append(position)
                 assignments.append(
                     AssignmentModel(
                         slot_id=slot.slot_id,
@@ -158,17 +303,18 @@ class RosteringService:
                 )
         assignments.sort(key=lambda assignment: (assignment.guard_id, assignment.start))
 
-        required_total = sum(slot.required_guards for slot in self._slots)
-        assigned_total = len(assignments)
-        coverage_ratio = assigned_total / required_total if required_total else 0.0
+        # Engine results carry per-slot count arrays; mock schedules are counted here.
+        if coverage_required is None or coverage_assigned is None:
+            coverage_required = self._slot_required
+            coverage_assigned = np.bincount(
+                np.asarray(slot_positions, dtype=np.intp), minlength=len(self._slots)
+            ).astype(np.int64, copy=False)
+        coverage_ratio = float(_numeric.coverage_ratio(coverage_required, coverage_assigned))
 
-        guard_counts = [len(ids) for ids in assignments_map.values() if ids]
-        if guard_counts:
-            average = sum(guard_counts) / len(guard_counts)
-            dispersion = max(abs(count - average) for count in guard_counts)
-            fairness_score = max(0.0, 1.0 - dispersion / max(average, 1.0))
-        else:
-            fairness_score = 1.0
+        guard_counts = np.fromiter(
+            (len(ids) for ids in assignments_map.values() if ids), dtype=np.int64
+        )
+        fairness_score = float(_numeric.fairness_score(guard_counts))
 
         fatigue_status = "Low" if criteria.toggles.get("prioritizeRest", True) else "Moderate"
 
@@ -213,7 +359,19 @@ class RosteringService:
 
 service = RosteringService()
 
-app = FastAPI(title="PSG Rostering API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    _numeric.warm_up()
+    warm_up_engine()
+    yield
+
+
+app = FastAPI(
+    title="PSG Rostering API",
+    version="0.1.0",
+    lifespan=lifespan,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -224,28 +382,65 @@ app.add_middleware(
 
 
 @app.post("/api/solve")
-async def solve(criteria: EngineCriteriaModel) -> Dict[str, object]:
-    schedule = await run_in_threadpool(service.generate_schedule, criteria)
-    return schedule.model_dump(by_alias=True)
+async def solve(criteria: EngineCriteriaModel) -> Response:
+    cached = service.cached_schedule_bytes(criteria)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers={"x-cache": "hit"})
+    body = await run_in_threadpool(service.generate_schedule_bytes, criteria)
+    return Response(content=body, media_type="application/json", headers={"x-cache": "miss"})
+
+
+async def _receive_frame(websocket: WebSocket) -> Union[bytes, str]:
+    """Return the next frame's data, accepting both binary and text frames."""
+
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    data = message.get("bytes")
+    return data if data is not None else message["text"]
+
+
+def _decode_msgpack_frame(frame: Union[bytes, str]) -> CriteriaMessage:
+    # MessagePack is binary; a text frame on that subprotocol is malformed input.
+    if isinstance(frame, str):
+        raise msgspec.DecodeError("MessagePack messages must be sent as binary frames")
+    return _criteria_message_msgpack_decoder.decode(frame)
 
 
 @app.websocket("/ws/roster")
 async def roster_socket(websocket: WebSocket) -> None:
-    await websocket.accept()
-    await websocket.send_json({"type": "status", "payload": "Connected to PSG rostering engine"})
+    offered = websocket.scope.get("subprotocols") or []
+    if MSGPACK_SUBPROTOCOL in offered:
+        await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        wire_format = "msgpack"
+        encode_frame = _msgpack_encoder.encode
+        decode_frame: Callable[[Union[bytes, str]], CriteriaMessage] = _decode_msgpack_frame
+    else:
+        await websocket.accept(subprotocol=JSON_SUBPROTOCOL if JSON_SUBPROTOCOL in offered else None)
+        wire_format = "json"
+        encode_frame = orjson.dumps
+        decode_frame = _criteria_message_decoder.decode
+
+    await websocket.send_bytes(encode_frame({"type": "status", "payload": "Connected to PSG rostering engine"}))
     try:
         while True:
-            data = await websocket.receive_json()
-            message_type = data.get("type")
-            payload = data.get("payload")
-            if message_type != "criteria" or not isinstance(payload, dict):
-                await websocket.send_json({"type": "error", "payload": "Unsupported message"})
+            try:
+                message = decode_frame(await _receive_frame(websocket))
+            except msgspec.DecodeError:
+                await websocket.send_bytes(encode_frame({"type": "error", "payload": "Unsupported message"}))
                 continue
-            criteria = EngineCriteriaModel.model_validate(payload)
-            schedule = await run_in_threadpool(service.generate_schedule, criteria)
-            await websocket.send_json({"type": "result", "payload": schedule.model_dump(by_alias=True)})
+            criteria = message.payload
+            body = service.cached_schedule_bytes(criteria, wire_format)
+            if body is None:
+                body = await run_in_threadpool(service.generate_schedule_bytes, criteria, wire_format)
+            if wire_format == "json":
+                await websocket.send_bytes(b'{"type":"result","payload":' + body + b"}")
+            else:
+                await websocket.send_bytes(_msgpack_encoder.encode({"type": "result", "payload": msgspec.Raw(body)}))
+            # Cache hits never suspend; yield so one chatty client cannot starve other sockets.
+            await asyncio.sleep(0)
     except WebSocketDisconnect:
         return
     except Exception as exc:  # pragma: no cover - defensive logging path
-        await websocket.send_json({"type": "error", "payload": str(exc)})
+        await websocket.send_bytes(encode_frame({"type": "error", "payload": str(exc)}))
         await websocket.close()
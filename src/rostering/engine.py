@@ -17,10 +17,18 @@ The engine can be used in two different modes:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import hashlib
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
 try:  # pragma: no cover - import guard to keep module importable without ortools
     from ortools.sat.python import cp_model
 except ImportError as exc:  # pragma: no cover - surface a clear runtime error when needed
@@ -29,38 +37,96 @@ except ImportError as exc:  # pragma: no cover - surface a clear runtime error w
 else:
     _ORTOOLS_IMPORT_ERROR = None
 
+try:  # pragma: no cover - optional JIT for the slot-pair scan
+    from numba import njit
+except ImportError:  # pragma: no cover - the interpreted bisect sweep is used instead
+    njit = None  # type: ignore[assignment]
+
+# Number of recent solve results each engine keeps, keyed by an input fingerprint.
+_SOLVE_CACHE_SIZE = 16
+# Only these outcomes are final; a retry could improve on anything else.
+_PROVEN_STATUSES = frozenset({"OPTIMAL", "INFEASIBLE"})
+
+
+if sys.version_info >= (3, 10):
+
+    @dataclass(frozen=True, slots=True)
+    class GuardProfile:
+        """Describes an individual guard that can be assigned to shifts."""
+
+        guard_id: str
+        name: str
+        skills: Sequence[str] = field(default_factory=tuple)
+        max_hours_per_week: Optional[float] = None
+        priority: int = 0
+
+    @dataclass(frozen=True, slots=True)
+    class DemandSlot:
+        """Represents a demand requirement for a contiguous block of time."""
+
+        slot_id: str
+        start: datetime
+        end: datetime
+        required_guards: int = 1
+        required_skill: Optional[str] = None
+        # Derived once in __post_init__; the record is immutable, so they stay valid.
+        _duration_hours: float = field(init=False, repr=False, compare=False)
+        _day_index: int = field(init=False, repr=False, compare=False)
+
+        def __post_init__(self) -> None:
+            delta = self.end - self.start
+            object.__setattr__(self, "_duration_hours", delta.total_seconds() / 3600.0)
+            object.__setattr__(self, "_day_index", self.start.date().toordinal())
+
+        def duration_hours(self) -> float:
+            """Return the duration of the slot in hours."""
 
-@dataclass(frozen=True)
-class GuardProfile:
-    """Describes an individual guard that can be assigned to shifts."""
+            return self._duration_hours
 
-    guard_id: str
-    name: str
-    skills: Sequence[str] = field(default_factory=tuple)
-    max_hours_per_week: Optional[float] = None
-    priority: int = 0
+        def day_index(self) -> int:
+            """Return a comparable day index for consecutive-day calculations."""
 
+            return self._day_index
 
-@dataclass(frozen=True)
-class DemandSlot:
-    """Represents a demand requirement for a contiguous block of time."""
+else:  # pragma: no cover - ``slots`` requires Python 3.10+
 
-    slot_id: str
-    start: datetime
-    end: datetime
-    required_guards: int = 1
-    required_skill: Optional[str] = None
+    @dataclass(frozen=True)
+    class GuardProfile:
+        """Describes an individual guard that can be assigned to shifts."""
 
-    def duration_hours(self) -> float:
-        """Return the duration of the slot in hours."""
+        guard_id: str
+        name: str
+        skills: Sequence[str] = field(default_factory=tuple)
+        max_hours_per_week: Optional[float] = None
+        priority: int = 0
 
-        delta = self.end - self.start
-        return delta.total_seconds() / 3600.0
+    @dataclass(frozen=True)
+    class DemandSlot:
+        """Represents a demand requirement for a contiguous block of time."""
 
-    def day_index(self) -> int:
-        """Return a comparable day index for consecutive-day calculations."""
+        slot_id: str
+        start: datetime
+        end: datetime
+        required_guards: int = 1
+        required_skill: Optional[str] = None
+        # Derived once in __post_init__; the record is immutable, so they stay valid.
+        _duration_hours: float = field(init=False, repr=False, compare=False)
+        _day_index: int = field(init=False, repr=False, compare=False)
 
-        return self.start.date().toordinal()
+        def __post_init__(self) -> None:
+            delta = self.end - self.start
+            object.__setattr__(self, "_duration_hours", delta.total_seconds() / 3600.0)
+            object.__setattr__(self, "_day_index", self.start.date().toordinal())
+
+        def duration_hours(self) -> float:
+            """Return the duration of the slot in hours."""
+
+            return self._duration_hours
+
+        def day_index(self) -> int:
+            """Return a comparable day index for consecutive-day calculations."""
+
+            return self._day_index
 
 
 @dataclass
@@ -92,6 +158,18 @@ class RosterConstraintConfig:
     hard: HardConstraintSpec = field(default_factory=HardConstraintSpec)
     soft: SoftConstraintWeights = field(default_factory=SoftConstraintWeights)
     fairness_target_hours: Optional[float] = None
+    # Run length penalised by ``consecutive_day_violation`` when no hard cap is set.
+    preferred_max_consecutive_days: int = 5
+    # CP-SAT search parameters. The optional knobs keep the solver's own
+    # default when left as ``None``.
+    num_workers: int = 8
+    random_seed: int = 1
+    log_search_progress: bool = False
+    linearization_level: Optional[int] = None
+    cp_model_probing_level: Optional[int] = None
+    symmetry_level: Optional[int] = None
+    optimize_with_core: Optional[bool] = None
+    boolean_encoding_level: Optional[int] = None
 
 
 @dataclass
@@ -105,6 +183,9 @@ class RosterResult:
     coverage: Dict[str, Dict[str, int]]
     status: str
     solver_statistics: Optional[str] = None
+    # ``coverage`` as slot-ordered int64 arrays, for vectorised KPI sums.
+    coverage_required: Optional[np.ndarray] = None
+    coverage_assigned: Optional[np.ndarray] = None
 
 
 @dataclass
@@ -116,6 +197,171 @@ class StaffingResult:
     attempts: Dict[int, RosterResult]
 
 
+def _nearby_slot_pairs(
+    slot_start: Sequence[float], slot_end: Sequence[float], horizon_seconds: float
+) -> List[Tuple[int, int]]:
+    """Return index pairs ``(i, j)``, ``i < j``, whose end-to-start gap in either
+    direction is within ``horizon_seconds``.
+
+    Slots are swept in start order and each slot's end is matched against the
+    sorted starts with a binary search, so only pairs that can violate a break
+    or rest window are produced instead of all ``S**2 / 2`` combinations.
+    """
+
+    if horizon_seconds <= 0:
+        return []
+    order = sorted(range(len(slot_start)), key=slot_start.__getitem__)
+    sorted_starts = [slot_start[idx] for idx in order]
+    pairs = set()
+    for a, end in enumerate(slot_end):
+        lo = bisect_left(sorted_starts, end - horizon_seconds)
+        hi = bisect_right(sorted_starts, end + horizon_seconds)
+        for pos in range(lo, hi):
+            b = order[pos]
+            if b != a:
+                pairs.add((a, b) if a < b else (b, a))
+    return sorted(pairs)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _pair_flags(start_i, end_i, start_j, end_j, min_break_hours, rest_window_hours):
+        # NaN thresholds disable a rule: every comparison against NaN is false.
+        gap_after_first = (start_j - end_i) / 3600.0
+        gap_before_first = (start_i - end_j) / 3600.0
+        flags = 0
+        if -min_break_hours < gap_after_first < min_break_hours:
+            flags |= 1
+        if 0 <= gap_after_first < rest_window_hours:
+            flags |= 2
+        if 0 <= gap_before_first < rest_window_hours:
+            flags |= 4
+        return flags
+
+    @njit(cache=True)
+    def _slot_pair_flags(slot_start, slot_end, min_break_hours, rest_window_hours):
+        count = slot_start.shape[0]
+        total = 0
+        for i in range(count):
+            for j in range(i + 1, count):
+                if _pair_flags(
+                    slot_start[i], slot_end[i], slot_start[j], slot_end[j], min_break_hours, rest_window_hours
+                ):
+                    total += 1
+        first = np.empty(total, dtype=np.int32)
+        second = np.empty(total, dtype=np.int32)
+        flags = np.empty(total, dtype=np.int8)
+        pos = 0
+        for i in range(count):
+            for j in range(i + 1, count):
+                pair = _pair_flags(
+                    slot_start[i], slot_end[i], slot_start[j], slot_end[j], min_break_hours, rest_window_hours
+                )
+                if pair:
+                    first[pos] = i
+                    second[pos] = j
+                    flags[pos] = pair
+                    pos += 1
+        return first, second, flags
+
+else:  # pragma: no cover - numba not installed
+    _slot_pair_flags = None
+
+
+def _slot_pair_rules(
+    slot_start: Sequence[float],
+    slot_end: Sequence[float],
+    min_break: Optional[float],
+    rest_window: Optional[float],
+) -> List[Tuple[int, int, bool, bool, bool]]:
+    """Return ``(i, j, break_clash, rest_after, rest_before)`` for every slot pair
+    ``i < j`` that falls under the minimum-break or rest-window rule.
+
+    ``rest_after`` means slot ``j`` starts within the rest window after slot
+    ``i`` ends and ``rest_before`` the reverse. With Numba installed the pairs
+    are scanned by a compiled kernel; otherwise by the bisect sweep.
+    """
+
+    if _slot_pair_flags is not None:
+        first, second, flags = _slot_pair_flags(
+            np.asarray(slot_start, dtype=np.float64),
+            np.asarray(slot_end, dtype=np.float64),
+            np.nan if min_break is None else float(min_break),
+            np.nan if rest_window is None else float(rest_window),
+        )
+        return [
+            (i, j, bool(flag & 1), bool(flag & 2), bool(flag & 4))
+            for i, j, flag in zip(first.tolist(), second.tolist(), flags.tolist())
+        ]
+
+    horizon_seconds = max(min_break or 0.0, rest_window or 0.0) * 3600.0
+    rules: List[Tuple[int, int, bool, bool, bool]] = []
+    for i, j in _nearby_slot_pairs(slot_start, slot_end, horizon_seconds):
+        gap_after_first = (slot_start[j] - slot_end[i]) / 3600.0
+        gap_before_first = (slot_start[i] - slot_end[j]) / 3600.0
+        break_clash = min_break is not None and -min_break < gap_after_first < min_break
+        rest_after = rest_window is not None and 0 <= gap_after_first < rest_window
+        rest_before = rest_window is not None and 0 <= gap_before_first < rest_window
+        if break_clash or rest_after or rest_before:
+            rules.append((i, j, break_clash, rest_after, rest_before))
+    return rules
+
+
+def warm_up() -> None:
+    """Compile the slot-pair kernel ahead of the first solve when Numba is installed."""
+
+    _slot_pair_rules([0.0, 3600.0], [3600.0, 7200.0], 1.0, 1.0)
+
+
+def _conflict_cliques(
+    conflicts: Sequence[Tuple[int, int]], slot_start: Sequence[float]
+) -> List[List[int]]:
+    """Cover the conflicting slot pairs with cliques of mutually conflicting slots.
+
+    Each pair not yet covered is grown greedily, in start order, by the common
+    neighbours that conflict with every member so far. Every pair ends up in
+    at least one clique, so one at-most-one constraint per clique replaces the
+    pairwise ``x + y <= 1`` rows.
+    """
+
+    neighbours: Dict[int, set] = {}
+    for i, j in conflicts:
+        neighbours.setdefault(i, set()).add(j)
+        neighbours.setdefault(j, set()).add(i)
+    covered = set()
+    cliques: List[List[int]] = []
+    for i, j in conflicts:
+        if (i, j) in covered:
+            continue
+        clique = [i, j]
+        for k in sorted(neighbours[i] & neighbours[j], key=slot_start.__getitem__):
+            if all(member in neighbours[k] for member in clique):
+                clique.append(k)
+        for pos, a in enumerate(clique):
+            for b in clique[pos + 1 :]:
+                covered.add((a, b) if a < b else (b, a))
+        cliques.append(clique)
+    return cliques
+
+
+def _probe_feasibility(
+    constraint_config: RosterConstraintConfig,
+    guards: Sequence[GuardProfile],
+    demand_slots: Sequence[DemandSlot],
+    time_limit_seconds: Optional[float],
+) -> RosterResult:
+    """Process-pool entry point for a single pool-size feasibility check."""
+
+    engine = RosterEngine(constraint_config)
+    return engine.solve(
+        guards,
+        demand_slots,
+        time_limit_seconds=time_limit_seconds,
+        stop_after_first_solution=True,
+    )
+
+
 class RosterEngine:
     """High-level façade for CP-SAT based rostering."""
 
@@ -125,172 +371,265 @@ class RosterEngine:
                 "OR-Tools is required to use the rostering engine"
             ) from _ORTOOLS_IMPORT_ERROR
         self.constraint_config = constraint_config or RosterConstraintConfig()
+        self._solve_cache: "OrderedDict[bytes, RosterResult]" = OrderedDict()
+
+    def update_config(self, constraint_config: RosterConstraintConfig) -> None:
+        """Replace the constraint configuration used by subsequent solves."""
+
+        self.constraint_config = constraint_config
 
     def solve(
         self,
         guards: Sequence[GuardProfile],
         demand_slots: Sequence[DemandSlot],
         time_limit_seconds: Optional[float] = None,
+        stop_after_first_solution: bool = False,
     ) -> RosterResult:
-        """Solve for guard assignments given a fixed set of guards and demand."""
+        """Solve for guard assignments given a fixed set of guards and demand.
+
+        ``stop_after_first_solution`` turns the call into a feasibility check:
+        the first roster found is returned without optimising the penalties.
+
+        Proven results (optimal or infeasible) are memoised per engine on a
+        fingerprint of the inputs and the constraint configuration, so the
+        returned object may be shared between calls and must not be mutated.
+        Time-limited or first-solution outcomes are never reused, and solves
+        with ``log_search_progress`` set always run.
+        """
+
+        if self.constraint_config.log_search_progress:
+            return self._solve(guards, demand_slots, time_limit_seconds, stop_after_first_solution)
+
+        key = self._solve_cache_key(guards, demand_slots, time_limit_seconds, stop_after_first_solution)
+        cached = self._solve_cache.get(key)
+        if cached is not None:
+            self._solve_cache.move_to_end(key)
+            return cached
+
+        result = self._solve(guards, demand_slots, time_limit_seconds, stop_after_first_solution)
+        if result.status in _PROVEN_STATUSES:
+            self._solve_cache[key] = result
+            if len(self._solve_cache) > _SOLVE_CACHE_SIZE:
+                self._solve_cache.popitem(last=False)
+        return result
+
+    def _solve_cache_key(
+        self,
+        guards: Sequence[GuardProfile],
+        demand_slots: Sequence[DemandSlot],
+        time_limit_seconds: Optional[float],
+        stop_after_first_solution: bool,
+    ) -> bytes:
+        # Dataclass reprs cover every field, including nested constraint specs.
+        fingerprint = repr(
+            (
+                tuple(guards),
+                tuple(demand_slots),
+                self.constraint_config,
+                time_limit_seconds,
+                stop_after_first_solution,
+            )
+        )
+        return hashlib.blake2b(fingerprint.encode(), digest_size=16).digest()
 
+    def _solve(
+        self,
+        guards: Sequence[GuardProfile],
+        demand_slots: Sequence[DemandSlot],
+        time_limit_seconds: Optional[float],
+        stop_after_first_solution: bool,
+    ) -> RosterResult:
         model = cp_model.CpModel()
-        assignments: Dict[Tuple[int, int], cp_model.IntVar] = {}
-        penalty_terms: List[Tuple[int, cp_model.IntVar, str]] = []
+        # (weight, term, name template, template args); names are only formatted
+        # for the penalties that fire in the solution.
+        penalty_terms: List[Tuple[int, cp_model.IntVar, str, Tuple[object, ...]]] = []
         coverage_stats: Dict[str, Dict[str, int]] = {}
 
-        for g_idx, guard in enumerate(guards):
-            for s_idx, slot in enumerate(demand_slots):
-                variable = model.NewBoolVar(f"assign_g{g_idx}_s{s_idx}")
-                assignments[(g_idx, s_idx)] = variable
-                if (
-                    self.constraint_config.hard.enforce_skill_requirements
-                    and slot.required_skill
-                    and slot.required_skill not in set(guard.skills)
-                ):
-                    model.Add(variable == 0)
+        # Per-slot data is extracted once into parallel lists; the loops below
+        # index these instead of re-reading DemandSlot attributes.
+        origin = demand_slots[0].start if demand_slots else datetime.min
+        slot_ids = [slot.slot_id for slot in demand_slots]
+        slot_start = [(slot.start - origin).total_seconds() for slot in demand_slots]
+        slot_end = [(slot.end - origin).total_seconds() for slot in demand_slots]
+        slot_day = [slot.day_index() for slot in demand_slots]
+        slot_required = [slot.required_guards for slot in demand_slots]
+        slot_skill = [slot.required_skill for slot in demand_slots]
+
+        # assignment_grid[g][s] holds the assignment literal, or None for a
+        # skill-ineligible (guard, slot) pair; every consumer below treats a
+        # missing entry as a fixed zero.
+        guard_skill_sets = [frozenset(guard.skills) for guard in guards]
+        enforce_skills = self.constraint_config.hard.enforce_skill_requirements
+        assignment_grid: List[List[Optional[cp_model.IntVar]]] = [
+            [None] * len(demand_slots) for _ in guards
+        ]
+        slots_by_guard: List[List[int]] = [[] for _ in guards]
+        guards_by_slot: List[List[int]] = [[] for _ in demand_slots]
+        for g_idx in range(len(guards)):
+            skill_set = guard_skill_sets[g_idx]
+            row = assignment_grid[g_idx]
+            for s_idx, required_skill in enumerate(slot_skill):
+                if enforce_skills and required_skill and required_skill not in skill_set:
+                    continue
+                row[s_idx] = model.NewBoolVar("")
+                slots_by_guard[g_idx].append(s_idx)
+                guards_by_slot[s_idx].append(g_idx)
 
         # Coverage constraints
-        for s_idx, slot in enumerate(demand_slots):
-            assigned = [assignments[(g_idx, s_idx)] for g_idx in range(len(guards))]
-            required = slot.required_guards
-            coverage_stats[slot.slot_id] = {"required": required}
+        for s_idx, slot_id in enumerate(slot_ids):
+            assigned = cp_model.LinearExpr.Sum(
+                [assignment_grid[g_idx][s_idx] for g_idx in guards_by_slot[s_idx]]
+            )
+            required = slot_required[s_idx]
+            coverage_stats[slot_id] = {"required": required}
             if self.constraint_config.hard.enforce_coverage:
-                model.Add(sum(assigned) >= required)
+                model.Add(assigned >= required)
             else:
-                slack = model.NewIntVar(0, required, f"coverage_slack_{s_idx}")
-                model.Add(sum(assigned) + slack >= required)
+                slack = model.NewIntVar(0, required, "")
+                model.Add(assigned + slack >= required)
                 penalty_terms.append(
                     (
                         self.constraint_config.soft.coverage_shortfall,
                         slack,
-                        f"coverage_shortfall::{slot.slot_id}",
+                        "coverage_shortfall::%s",
+                        (slot_id,),
                     )
                 )
 
-        # Guard daily presence and max consecutive days.
-        if self.constraint_config.hard.max_consecutive_days is not None or self.constraint_config.soft.consecutive_day_violation:
+        # Guard daily presence and max consecutive days, as sliding windows of
+        # max + 1 days. The soft limit gets one 0/1 slack per window marking a
+        # run longer than preferred_max_consecutive_days.
+        max_consec = self.constraint_config.hard.max_consecutive_days
+        consecutive_weight = self.constraint_config.soft.consecutive_day_violation
+        if max_consec is not None:
+            window = max_consec + 1
+        elif consecutive_weight:
+            window = self.constraint_config.preferred_max_consecutive_days + 1
+        else:
+            window = 0
+        if window > 0:
             slots_by_day: Dict[int, List[int]] = {}
-            for idx, slot in enumerate(demand_slots):
-                slots_by_day.setdefault(slot.day_index(), []).append(idx)
+            for idx, day in enumerate(slot_day):
+                slots_by_day.setdefault(day, []).append(idx)
             sorted_days = sorted(slots_by_day)
-            day_presence: Dict[Tuple[int, int], cp_model.IntVar] = {}
-            for g_idx in range(len(guards)):
-                for day_idx, day in enumerate(sorted_days):
-                    presence = model.NewBoolVar(f"presence_g{g_idx}_d{day_idx}")
-                    day_slots = slots_by_day[day]
-                    slot_vars = [assignments[(g_idx, s_idx)] for s_idx in day_slots]
-                    model.Add(sum(slot_vars) >= 1).OnlyEnforceIf(presence)
-                    model.Add(sum(slot_vars) == 0).OnlyEnforceIf(presence.Not())
-                    day_presence[(g_idx, day_idx)] = presence
-
-                if not sorted_days:
-                    continue
-                max_consec = self.constraint_config.hard.max_consecutive_days
-                if max_consec is not None:
-                    for start in range(0, len(sorted_days) - max_consec):
-                        window_presence = [
-                            day_presence[(g_idx, day_idx)]
-                            for day_idx in range(start, start + max_consec + 1)
-                        ]
-                        model.Add(sum(window_presence) <= max_consec)
-                elif self.constraint_config.soft.consecutive_day_violation:
-                    max_consec = 0
-                    for start in range(0, len(sorted_days)):
-                        window_presence = [
-                            day_presence[(g_idx, day_idx)]
-                            for day_idx in range(start, len(sorted_days))
-                        ]
-                        window_sum = model.NewIntVar(
-                            0,
-                            len(window_presence),
-                            f"consec_sum_g{g_idx}_w{start}",
-                        )
-                        model.Add(window_sum == sum(window_presence))
-                        slack = model.NewIntVar(
-                            0,
-                            len(window_presence),
-                            f"consec_slack_g{g_idx}_w{start}",
-                        )
-                        model.Add(window_sum <= max_consec + slack)
-                        penalty_terms.append(
-                            (
-                                self.constraint_config.soft.consecutive_day_violation,
-                                slack,
-                                f"consecutive_day_violation::guard={guards[g_idx].guard_id}::window={start}",
-                            )
+        # Presence variables are only needed when at least one window fits.
+        if window > 0 and len(sorted_days) >= window:
+            for g_idx, row in enumerate(assignment_grid):
+                # presence == OR(slot literals) as a clause set; a single eligible
+                # slot is its own presence literal and a day without one is left
+                # out of the windows as a fixed zero.
+                day_presence: List[Optional[cp_model.IntVar]] = []
+                for day in sorted_days:
+                    slot_vars = [row[s_idx] for s_idx in slots_by_day[day] if row[s_idx] is not None]
+                    if len(slot_vars) > 1:
+                        presence = model.NewBoolVar("")
+                        model.AddMaxEquality(presence, slot_vars)
+                        day_presence.append(presence)
+                    else:
+                        day_presence.append(slot_vars[0] if slot_vars else None)
+
+                for start in range(0, len(sorted_days) - window + 1):
+                    window_literals = [
+                        presence
+                        for presence in day_presence[start : start + window]
+                        if presence is not None
+                    ]
+                    # Too few workable days in the window to ever exceed the limit.
+                    if len(window_literals) < window:
+                        continue
+                    window_presence = cp_model.LinearExpr.Sum(window_literals)
+                    if max_consec is not None:
+                        model.Add(window_presence <= max_consec)
+                        continue
+                    slack = model.NewBoolVar("")
+                    model.Add(window_presence <= window - 1 + slack)
+                    penalty_terms.append(
+                        (
+                            consecutive_weight,
+                            slack,
+                            "consecutive_day_violation::guard=%s::window=%d",
+                            (guards[g_idx].guard_id, start),
                         )
+                    )
 
         # Rest windows and minimum breaks between shifts for each guard.
         min_break = self.constraint_config.hard.min_break_hours
         rest_window = self.constraint_config.hard.rest_window_hours
         soft_break_weight = self.constraint_config.soft.min_break_violation
         soft_rest_weight = self.constraint_config.soft.rest_window_violation
-        for g_idx in range(len(guards)):
-            for i, first in enumerate(demand_slots):
-                for j, second in enumerate(demand_slots):
-                    if j <= i:
+        # Both windows are defined by the hard settings; without either there is
+        # nothing to constrain or penalise.
+        if min_break is not None or rest_window is not None:
+            # The rules a pair triggers depend only on the slots, so pairs are
+            # classified once. Pairs under a hard rule become clique constraints;
+            # the remaining soft rules are penalised pair by pair.
+            hard_break = self.constraint_config.hard.min_break_hours is not None
+            hard_rest = self.constraint_config.hard.rest_window_hours is not None
+            conflicts: List[Tuple[int, int]] = []
+            pair_rules: List[Tuple[int, int, bool, bool, bool]] = []
+            for i, j, break_clash, rest_after, rest_before in _slot_pair_rules(
+                slot_start, slot_end, min_break, rest_window
+            ):
+                if (break_clash and hard_break) or ((rest_after or rest_before) and hard_rest):
+                    conflicts.append((i, j))
+                else:
+                    pair_rules.append((i, j, break_clash, rest_after, rest_before))
+            cliques = _conflict_cliques(conflicts, slot_start)
+
+            for g_idx, row in enumerate(assignment_grid):
+                for clique in cliques:
+                    literals = [row[s_idx] for s_idx in clique if row[s_idx] is not None]
+                    if len(literals) > 1:
+                        model.AddAtMostOne(literals)
+
+                guard_id = guards[g_idx].guard_id
+                for i, j, break_clash, rest_after, rest_before in pair_rules:
+                    assign_first = row[i]
+                    assign_second = row[j]
+                    if assign_first is None or assign_second is None:
                         continue
-                    gap_after_first = (second.start - first.end).total_seconds() / 3600.0
-                    gap_before_first = (first.start - second.end).total_seconds() / 3600.0
-                    assign_first = assignments[(g_idx, i)]
-                    assign_second = assignments[(g_idx, j)]
-                    if min_break is not None and -min_break < gap_after_first < min_break:
-                        if self.constraint_config.hard.min_break_hours is not None:
-                            model.Add(assign_first + assign_second <= 1)
-                        elif soft_break_weight:
-                            slack = model.NewBoolVar(
-                                f"break_slack_g{g_idx}_{i}_{j}"
-                            )
-                            model.Add(assign_first + assign_second <= 1 + slack)
-                            penalty_terms.append(
-                                (
-                                    soft_break_weight,
-                                    slack,
-                                    f"min_break_violation::guard={guards[g_idx].guard_id}::{first.slot_id}->{second.slot_id}",
-                                )
-                            )
-                    if rest_window is not None and 0 <= gap_after_first < rest_window:
-                        if self.constraint_config.hard.rest_window_hours is not None:
-                            model.Add(assign_first + assign_second <= 1)
-                        elif soft_rest_weight:
-                            slack = model.NewBoolVar(
-                                f"rest_slack_g{g_idx}_{i}_{j}"
+                    if break_clash and soft_break_weight:
+                        slack = model.NewBoolVar("")
+                        model.Add(assign_first + assign_second <= 1 + slack)
+                        penalty_terms.append(
+                            (
+                                soft_break_weight,
+                                slack,
+                                "min_break_violation::guard=%s::%s->%s",
+                                (guard_id, slot_ids[i], slot_ids[j]),
                             )
-                            model.Add(assign_first + assign_second <= 1 + slack)
-                            penalty_terms.append(
-                                (
-                                    soft_rest_weight,
-                                    slack,
-                                    f"rest_window_violation::guard={guards[g_idx].guard_id}::{first.slot_id}->{second.slot_id}",
-                                )
+                        )
+                    if rest_after and soft_rest_weight:
+                        slack = model.NewBoolVar("")
+                        model.Add(assign_first + assign_second <= 1 + slack)
+                        penalty_terms.append(
+                            (
+                                soft_rest_weight,
+                                slack,
+                                "rest_window_violation::guard=%s::%s->%s",
+                                (guard_id, slot_ids[i], slot_ids[j]),
                             )
+                        )
                     # also check symmetric direction
-                    if rest_window is not None and 0 <= gap_before_first < rest_window:
-                        if self.constraint_config.hard.rest_window_hours is not None:
-                            model.Add(assign_first + assign_second <= 1)
-                        elif soft_rest_weight:
-                            slack = model.NewBoolVar(
-                                f"rest_slack_g{g_idx}_{j}_{i}"
-                            )
-                            model.Add(assign_first + assign_second <= 1 + slack)
-                            penalty_terms.append(
-                                (
-                                    soft_rest_weight,
-                                    slack,
-                                    f"rest_window_violation::guard={guards[g_idx].guard_id}::{second.slot_id}->{first.slot_id}",
-                                )
+                    if rest_before and soft_rest_weight:
+                        slack = model.NewBoolVar("")
+                        model.Add(assign_first + assign_second <= 1 + slack)
+                        penalty_terms.append(
+                            (
+                                soft_rest_weight,
+                                slack,
+                                "rest_window_violation::guard=%s::%s->%s",
+                                (guard_id, slot_ids[j], slot_ids[i]),
                             )
+                        )
 
         # Guard load tracking for fairness calculations.
         guard_totals: Dict[int, cp_model.IntVar] = {}
-        for g_idx in range(len(guards)):
-            total_assignments = model.NewIntVar(0, len(demand_slots), f"total_assign_g{g_idx}")
+        for g_idx, row in enumerate(assignment_grid):
+            total_assignments = model.NewIntVar(0, len(demand_slots), "")
             guard_totals[g_idx] = total_assignments
-            model.Add(
-                total_assignments
-                == sum(assignments[(g_idx, s_idx)] for s_idx in range(len(demand_slots)))
-            )
+            row_vars = [row[s_idx] for s_idx in slots_by_guard[g_idx]]
+            model.Add(total_assignments == cp_model.LinearExpr.Sum(row_vars))
 
         fairness_weight = self.constraint_config.soft.fairness_penalty
         if fairness_weight and guard_totals:
@@ -306,71 +645,82 @@ class RosterEngine:
                     fairness_weight,
                     fairness_span,
                     "fairness_span",
+                    (),
                 )
             )
 
             target_hours = self.constraint_config.fairness_target_hours
             if target_hours is not None and demand_slots:
-                average_slot_hours = (
-                    sum(slot.duration_hours() for slot in demand_slots) / len(demand_slots)
-                )
+                slot_seconds = np.asarray(slot_end) - np.asarray(slot_start)
+                average_slot_hours = float(slot_seconds.mean()) / 3600.0
                 if average_slot_hours <= 0:
                     average_slot_hours = 1.0
                 expected_assignments = max(
                     0, int(round(target_hours / average_slot_hours))
                 )
                 for g_idx, guard in enumerate(guards):
-                    deviation = model.NewIntVar(0, len(demand_slots), f"deviation_g{g_idx}")
+                    deviation = model.NewIntVar(0, len(demand_slots), "")
                     model.Add(deviation >= guard_totals[g_idx] - expected_assignments)
                     model.Add(deviation >= expected_assignments - guard_totals[g_idx])
                     penalty_terms.append(
                         (
                             fairness_weight,
                             deviation,
-                            f"fairness_target_deviation::guard={guard.guard_id}",
+                            "fairness_target_deviation::guard=%s",
+                            (guard.guard_id,),
                         )
                     )
 
         # Objective function accumulates all soft penalties.
         if penalty_terms:
-            objective_terms = [
-                weight * term for weight, term, _ in penalty_terms
-            ]
-            model.Minimize(sum(objective_terms))
+            model.Minimize(
+                cp_model.LinearExpr.WeightedSum(
+                    [term for _, term, _, _ in penalty_terms],
+                    [weight for weight, _, _, _ in penalty_terms],
+                )
+            )
 
         solver = cp_model.CpSolver()
+        self._apply_solver_parameters(solver.parameters)
         if time_limit_seconds:
             solver.parameters.max_time_in_seconds = time_limit_seconds
+        if stop_after_first_solution:
+            solver.parameters.stop_after_first_solution = True
 
         status = solver.Solve(model)
         status_name = solver.StatusName(status)
         feasible = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
         assignments_output: Dict[str, List[str]] = {guard.guard_id: [] for guard in guards}
 
+        # The solution vector is copied out once and indexed by variable instead
+        # of crossing into the solver for every literal.
+        solution = list(solver.ResponseProto().solution) if feasible else []
+
         if feasible:
-            for (g_idx, s_idx), var in assignments.items():
-                if solver.BooleanValue(var):
-                    guard_id = guards[g_idx].guard_id
-                    slot_id = demand_slots[s_idx].slot_id
-                    assignments_output[guard_id].append(slot_id)
-
-            for s_idx, slot in enumerate(demand_slots):
-                assigned_count = sum(
-                    1
-                    for g_idx in range(len(guards))
-                    if solver.BooleanValue(assignments[(g_idx, s_idx)])
-                )
-                coverage_stats[slot.slot_id]["assigned"] = assigned_count
+            # Single pass over the solution: roster output and per-slot coverage together.
+            assigned_counts = [0] * len(demand_slots)
+            for g_idx, row in enumerate(assignment_grid):
+                guard_slots = assignments_output[guards[g_idx].guard_id]
+                # slots_by_guard lists only eligible slots, whose grid entries are set.
+                for s_idx in slots_by_guard[g_idx]:
+                    if solution[row[s_idx].Index()]:  # type: ignore[union-attr]
+                        guard_slots.append(slot_ids[s_idx])
+                        assigned_counts[s_idx] += 1
+
+            for s_idx, slot_id in enumerate(slot_ids):
+                coverage_stats[slot_id]["assigned"] = assigned_counts[s_idx]
+            coverage_assigned = np.array(assigned_counts, dtype=np.int64)
         else:
-            for slot in demand_slots:
-                coverage_stats[slot.slot_id].setdefault("assigned", 0)
+            for slot_id in slot_ids:
+                coverage_stats[slot_id].setdefault("assigned", 0)
+            coverage_assigned = np.zeros(len(demand_slots), dtype=np.int64)
 
         violation_summaries: Dict[str, Dict[str, float]] = {}
         if penalty_terms and feasible:
-            for weight, term, name in penalty_terms:
-                value = solver.Value(term)
+            for weight, term, template, args in penalty_terms:
+                value = solution[term.Index()]
                 if value:
-                    violation_summaries[name] = {
+                    violation_summaries[template % args] = {
                         "value": float(value),
                         "penalty": float(weight * value),
                     }
@@ -395,8 +745,26 @@ class RosterEngine:
             coverage=coverage_stats,
             status=status_name,
             solver_statistics=solver_stats,
+            coverage_required=np.array(slot_required, dtype=np.int64),
+            coverage_assigned=coverage_assigned,
         )
 
+    def _apply_solver_parameters(self, parameters: "cp_model.SatParameters") -> None:
+        cfg = self.constraint_config
+        parameters.num_workers = cfg.num_workers
+        parameters.random_seed = cfg.random_seed
+        parameters.log_search_progress = cfg.log_search_progress
+        for name in (
+            "linearization_level",
+            "cp_model_probing_level",
+            "symmetry_level",
+            "optimize_with_core",
+            "boolean_encoding_level",
+        ):
+            value = getattr(cfg, name)
+            if value is not None:
+                setattr(parameters, name, value)
+
     def find_minimum_staffing(
         self,
         guards: Sequence[GuardProfile],
@@ -404,8 +772,18 @@ class RosterEngine:
         minimum: int = 1,
         maximum: Optional[int] = None,
         time_limit_seconds: Optional[float] = None,
+        max_workers: Optional[int] = None,
     ) -> StaffingResult:
-        """Iteratively increase the guard pool until a feasible roster is found."""
+        """Find the smallest guard pool, in priority order, that admits a roster.
+
+        Feasibility is monotone in the pool size, so sizes are bracketed by
+        doubling and then narrowed by binary search. Probes are feasibility
+        checks; only the smallest feasible pool is re-solved to optimality.
+
+        The bracketing probes run in batches on a process pool of
+        ``max_workers`` processes (half the CPUs by default); with one worker
+        or fewer they run sequentially in this process.
+        """
 
         ordered_guards = sorted(guards, key=lambda g: (g.priority, g.guard_id))
         max_size = maximum or len(ordered_guards)
@@ -413,14 +791,72 @@ class RosterEngine:
         feasible_result: Optional[RosterResult] = None
         feasible_size: Optional[int] = None
 
-        for size in range(max(minimum, 1), max_size + 1):
-            subset = ordered_guards[:size]
-            result = self.solve(subset, demand_slots, time_limit_seconds=time_limit_seconds)
+        def probe(size: int) -> bool:
+            result = self.solve(
+                ordered_guards[:size],
+                demand_slots,
+                time_limit_seconds=time_limit_seconds,
+                stop_after_first_solution=True,
+            )
             attempts[size] = result
-            if result.feasible:
-                feasible_result = result
-                feasible_size = size
+            return result.feasible
+
+        start = max(minimum, 1)
+        bracket: List[int] = []
+        size = start
+        while size <= max_size:
+            bracket.append(size)
+            if size == max_size:
                 break
+            size = min(size * 2, max_size)
+
+        cpu_count = os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = cpu_count // 2
+        max_workers = min(max_workers, len(bracket))
+
+        if max_workers > 1:
+            # Keep processes x CP-SAT threads within the hardware threads.
+            threads_per_probe = min(self.constraint_config.num_workers, cpu_count // max_workers)
+            probe_config = replace(self.constraint_config, num_workers=max(1, threads_per_probe))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for offset in range(0, len(bracket), max_workers):
+                    batch = bracket[offset : offset + max_workers]
+                    results = executor.map(
+                        _probe_feasibility,
+                        [probe_config] * len(batch),
+                        [ordered_guards[:batch_size] for batch_size in batch],
+                        [demand_slots] * len(batch),
+                        [time_limit_seconds] * len(batch),
+                    )
+                    for batch_size, result in zip(batch, results):
+                        attempts[batch_size] = result
+                        if result.feasible and feasible_size is None:
+                            feasible_size = batch_size
+                    if feasible_size is not None:
+                        break
+        else:
+            for size in bracket:
+                if probe(size):
+                    feasible_size = size
+                    break
+
+        if feasible_size is not None:
+            # Largest probed size below the feasible one, or below the search range.
+            lower = max((size for size in attempts if size < feasible_size), default=start - 1)
+            while lower + 1 < feasible_size:
+                middle = (lower + feasible_size) // 2
+                if probe(middle):
+                    feasible_size = middle
+                else:
+                    lower = middle
+
+            feasible_result = self.solve(
+                ordered_guards[:feasible_size],
+                demand_slots,
+                time_limit_seconds=time_limit_seconds,
+            )
+            attempts[feasible_size] = feasible_result
 
         return StaffingResult(
             minimum_guards=feasible_size,